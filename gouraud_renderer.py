@@ -1,4 +1,5 @@
 import math
+import numpy as np
 import pyxel
 from threed import Camera, Mesh
 
@@ -34,11 +35,16 @@ class GouraudRenderer:
     # スキャンラインによる Gouraud 三角形描画
     # ---------------------------------------------------
     def draw_gouraud_tri(self, p0, c0, p1, c1, p2, c2):
-        # 位置と色を y 昇順に並べる
-        pts = sorted([(p0, c0), (p1, c1), (p2, c2)], key=lambda x: x[0][1])
-        (x0, y0), c0 = pts[0]
-        (x1, y1), c1 = pts[1]
-        (x2, y2), c2 = pts[2]
+        # 位置と色を y 昇順に並べる（3 要素なので比較と交換で済ませる）
+        (x0, y0) = p0
+        (x1, y1) = p1
+        (x2, y2) = p2
+        if y0 > y1:
+            x0, y0, c0, x1, y1, c1 = x1, y1, c1, x0, y0, c0
+        if y1 > y2:
+            x1, y1, c1, x2, y2, c2 = x2, y2, c2, x1, y1, c1
+        if y0 > y1:
+            x0, y0, c0, x1, y1, c1 = x1, y1, c1, x0, y0, c0
 
         # 端点が重なる場合の対策
         if y1 == y2:
@@ -46,28 +52,36 @@ class GouraudRenderer:
         else:
             part2 = False
 
-        def interp(a, b, t):
-            return a + (b - a) * t
+        # ループ内で使う関数はローカルに束縛しておく
+        line = pyxel.line
+        ceil = math.ceil
+        floor = math.floor
+
+        # 各辺の y 1 ラインあたりの傾きはループの外で 1 度だけ求める
+        # 長辺 0→2、短辺 0→1（上半分）、短辺 1→2（下半分）
+        dx_long = (x2 - x0) / (y2 - y0) if y2 != y0 else 0
+        dc_long = (c2 - c0) / (y2 - y0) if y2 != y0 else 0
+        dx_top = (x1 - x0) / (y1 - y0) if y1 != y0 else 0
+        dc_top = (c1 - c0) / (y1 - y0) if y1 != y0 else 0
+        dx_bot = (x2 - x1) / (y2 - y1) if y2 != y1 else 0
+        dc_bot = (c2 - c1) / (y2 - y1) if y2 != y1 else 0
 
         # 主ループ（y0→y2を1パスで走査）
-        y_start = int(math.ceil(y0))
-        y_end = int(math.floor(y2))
+        y_start = int(ceil(y0))
+        y_end = int(floor(y2))
 
         for y in range(y_start, y_end + 1):
-            # yに対する t0, t2（長辺）
-            t_long = (y - y0) / (y2 - y0) if y2 != y0 else 0
-            xl = interp(x0, x2, t_long)
-            cl = interp(c0, c2, t_long)
+            # 長辺（除算なしで y から直接求める）
+            xl = x0 + (y - y0) * dx_long
+            cl = c0 + (y - y0) * dc_long
 
-            # yに対する短辺の補間対象は y1 で切り替える
+            # 短辺の補間対象は y1 で切り替える
             if y < y1 or part2:
-                t_short = (y - y0) / (y1 - y0) if y1 != y0 else 0
-                xr = interp(x0, x1, t_short)
-                cr = interp(c0, c1, t_short)
+                xr = x0 + (y - y0) * dx_top
+                cr = c0 + (y - y0) * dc_top
             else:
-                t_short = (y - y1) / (y2 - y1) if y2 != y1 else 0
-                xr = interp(x1, x2, t_short)
-                cr = interp(c1, c2, t_short)
+                xr = x1 + (y - y1) * dx_bot
+                cr = c1 + (y - y1) * dc_bot
 
             # 左右交換
             if xl > xr:
@@ -75,14 +89,24 @@ class GouraudRenderer:
                 cl, cr = cr, cl
 
             # 水平線描画
-            x_start = int(math.ceil(xl))
-            x_end = int(math.floor(xr))
+            x_start = int(ceil(xl))
+            x_end = int(floor(xr))
+
+            if x_start > x_end:
+                continue
 
-            for x in range(x_start, x_end + 1):
-                t = (x - xl) / (xr - xl) if xr != xl else 0
-                c = interp(cl, cr, t)
-                shade = int(c * 7)
-                pyxel.pset(x, y, shade)
+            # 同じ階調が続く区間をまとめて 1 本の水平線で描く
+            # （階調は 0〜7 なので 1 ラインあたり高々 8 回の呼び出し）
+            dc = (cr - cl) / (xr - xl) if xr != xl else 0
+            run_start = x_start
+            run_shade = int((cl + (x_start - xl) * dc) * 7)
+            for x in range(x_start + 1, x_end + 1):
+                shade = int((cl + (x - xl) * dc) * 7)
+                if shade != run_shade:
+                    line(run_start, y, x - 1, y, run_shade)
+                    run_start = x
+                    run_shade = shade
+            line(run_start, y, x_end, y, run_shade)
 
     # ---------------------------------------------------
     # メッシュ描画（メイン）
@@ -90,50 +114,38 @@ class GouraudRenderer:
     def draw_mesh(self, mesh: Mesh):
         cam = self.camera
 
-        # 頂点を world → camera → project
-        cam_pts = [cam.world_to_camera(*mesh.local_to_world(*p)) for p in mesh.points]
-        proj_pts = [None] * len(cam_pts)
+        # 頂点を world → camera → project（(N, 3) 配列で一括変換）
+        cam_np = cam.transform_points(mesh.get_model_matrix(), mesh.points_np)
 
-        for i, (x, y, z) in enumerate(cam_pts):
-            if z <= 0:
-                proj_pts[i] = None
-            else:
-                proj_pts[i] = cam.project(x, y, z)
+        sx, sy, _ = cam.project_many(cam_np)
+        proj_pts = list(zip(sx.tolist(), sy.tolist()))
 
-        # 頂点光強度
-        intens = []
-        for nx, ny, nz in mesh.vertex_normals:
-            intens.append(self.compute_intensity(nx, ny, nz))
+        # 頂点光強度（法線 (N, 3) とライト方向の積 1 回で全頂点分）
+        dot = mesh.vertex_normals_np @ np.asarray(self.light_dir)
+        intens = np.minimum(1.0, self.ambient + np.maximum(dot, 0.0) * 0.8).tolist()
 
-        # face depth ソート（手前を後に描く）
-        face_list = []
-        for idx, (i0, i1, i2) in enumerate(mesh.faces):
-            z0 = cam_pts[i0][2]
-            z1 = cam_pts[i1][2]
-            z2 = cam_pts[i2][2]
-            avgz = (z0 + z1 + z2) / 3
-            face_list.append((avgz, i0, i1, i2))
+        # 面ごとの可視判定・backface culling・深度を 1 パスでまとめて計算
+        faces = mesh.faces_np
+        v0 = cam_np[faces[:, 0]]
+        v1 = cam_np[faces[:, 1]]
+        v2 = cam_np[faces[:, 2]]
 
-        face_list.sort(reverse=True)  # 奥から描く
-        # face_list.sort()
+        # backface culling（カメラ座標系）
+        ux = v1[:, 0] - v0[:, 0]
+        uy = v1[:, 1] - v0[:, 1]
+        vx = v2[:, 0] - v0[:, 0]
+        vy = v2[:, 1] - v0[:, 1]
+        nz = ux * vy - uy * vx
 
-        # 描画
-        for avgz, i0, i1, i2 in face_list:
-            if proj_pts[i0] is None or proj_pts[i1] is None or proj_pts[i2] is None:
-                continue
+        avg_z = (v0[:, 2] + v1[:, 2] + v2[:, 2]) / 3.0
+        visible = (nz > 0) & (v0[:, 2] > 0) & (v1[:, 2] > 0) & (v2[:, 2] > 0)
 
-            # backface culling（カメラ座標系）
-            v0 = cam_pts[i0]
-            v1 = cam_pts[i1]
-            v2 = cam_pts[i2]
-            ux, uy, uz = (v1[0] - v0[0], v1[1] - v0[1], v1[2] - v0[2])
-            vx, vy, vz = (v2[0] - v0[0], v2[1] - v0[1], v2[2] - v0[2])
-            nx = uy * vz - uz * vy
-            # ny = uz*vx - ux*vz
-            nz = ux * vy - uy * vx
-            if nz <= 0:
-                continue
+        # 見える面だけを depth ソート（奥から描く）
+        idx = np.flatnonzero(visible)
+        order = idx[np.argsort(avg_z[idx], kind="stable")[::-1]]
 
+        # 描画
+        for i0, i1, i2 in faces[order].tolist():
             p0 = proj_pts[i0]
             p1 = proj_pts[i1]
             p2 = proj_pts[i2]
@@ -1,6 +1,64 @@
 import math
+import numpy as np
 import pyxel
-from threed import Camera, Mesh, normalize
+from threed import HAS_NUMBA, Camera, Mesh, njit, normalize
+
+
+@njit(cache=True)
+def _visible_faces(coverage, tri_xy):
+    """
+    手前から並んだ三角形 tri_xy (F, 6) を順に被覆し、
+    少しでも見える面を True とした (F,) の配列を返す。
+    """
+    n = tri_xy.shape[0]
+    visible = np.zeros(n, dtype=np.bool_)
+    for i in range(n):
+        x0, y0, x1, y1, x2, y2 = tri_xy[i]
+        visible[i] = _cover_triangle(coverage, x0, y0, x1, y1, x2, y2)
+    return visible
+
+
+@njit(cache=True)
+def _cover_triangle(coverage, x0, y0, x1, y1, x2, y2):
+    """
+    三角形が覆うピクセル（ピクセル中心で判定）を coverage に書き込み、
+    それまで覆われていなかったピクセルが 1 つでもあれば True を返す。
+    pyxel.tri は辺上のピクセルも塗るので、見えるかどうかの判定は
+    三角形を 1 ピクセル太らせた範囲で行う。
+    """
+    h, w = coverage.shape
+
+    # 符号付き面積の 2 倍（0 なら判定できないので描く扱い）
+    denom = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+    if denom == 0:
+        return True
+    sgn = 1.0 if denom > 0 else -1.0
+
+    # 辺関数を辺の長さで割ると辺からの距離になる
+    len0 = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+    len1 = math.sqrt((x0 - x2) ** 2 + (y0 - y2) ** 2)
+    len2 = math.sqrt((x1 - x0) ** 2 + (y1 - y0) ** 2)
+
+    min_x = max(int(min(x0, x1, x2)) - 1, 0)
+    max_x = min(int(max(x0, x1, x2)) + 1, w - 1)
+    min_y = max(int(min(y0, y1, y2)) - 1, 0)
+    max_y = min(int(max(y0, y1, y2)) + 1, h - 1)
+
+    visible = False
+    for y in range(min_y, max_y + 1):
+        yy = y + 0.5
+        for x in range(min_x, max_x + 1):
+            xx = x + 0.5
+            e0 = ((x2 - x1) * (yy - y1) - (y2 - y1) * (xx - x1)) * sgn
+            e1 = ((x0 - x2) * (yy - y2) - (y0 - y2) * (xx - x2)) * sgn
+            e2 = ((x1 - x0) * (yy - y0) - (y1 - y0) * (xx - x0)) * sgn
+            if e0 < -len0 or e1 < -len1 or e2 < -len2:
+                continue
+            if not coverage[y, x]:
+                visible = True
+            if e0 >= 0 and e1 >= 0 and e2 >= 0:
+                coverage[y, x] = True
+    return visible
 
 
 class HiddenLineRenderer:
@@ -13,6 +71,7 @@ class HiddenLineRenderer:
         base_color=7,
         shade=False,
         wired=False,
+        cull_occluded=False,
     ):
         self.camera = camera
         self.bg_color = bg_color
@@ -21,32 +80,66 @@ class HiddenLineRenderer:
         self.base_color = base_color
         self.shade = shade
         self.wired = wired
+        self.cull_occluded = cull_occluded
 
-    def draw_mesh(self, mesh: Mesh):
-        cam = self.camera
-
-        # 1. Mesh のローカル点 → ワールド座標へ
-        world_pts = mesh.transformed_points()
+        # 画面サイズ
+        if hasattr(camera, "screen_w"):
+            self.width = camera.screen_w
+            self.height = camera.screen_h
+        else:
+            self.width = camera.cx * 2
+            self.height = camera.cy * 2
 
-        # 2. ワールド → カメラ座標
-        cam_pts = [cam.world_to_camera(*p) for p in world_pts]
+        # 手前から塗ったピクセルの記録（完全に隠れた面を描かないため）
+        self.coverage = np.zeros((self.height, self.width), dtype=np.bool_)
 
-        # 3. 画面座標に投影
-        proj_pts = []
-        for x, y, z in cam_pts:
-            if z <= 0:
-                proj_pts.append((-9999, -9999))
-            else:
-                proj_pts.append(cam.project(x, y, z))
+    def draw_mesh(self, mesh: Mesh):
+        cam = self.camera
 
-        # 4. 面を深度順に並べる
+        # 1. ローカル → ワールド → カメラ座標
+        #    model-view を 1 回だけ合成して (N, 3) 配列に一括適用
+        cam_np = cam.transform_points(mesh.get_model_matrix(), mesh.points_np)
+        cam_pts = cam_np.tolist()
+
+        # 2. 画面座標に投影（カメラの後ろの頂点は -9999）
+        sx, sy, in_front = cam.project_many(cam_np)
+        sx = np.where(in_front, sx, -9999).tolist()
+        sy = np.where(in_front, sy, -9999).tolist()
+        proj_pts = list(zip(sx, sy))
+
+        # 3. 面を深度順に並べる
+        sqrt = math.sqrt
+        w = self.width
+        h = self.height
         face_info = []
         for i0, i1, i2 in mesh.faces:
             v0 = cam_pts[i0]
             v1 = cam_pts[i1]
             v2 = cam_pts[i2]
 
-            if v0[2] <= 0 and v1[2] <= 0 and v2[2] <= 0:
+            # カメラの後ろに頂点がある面は描かない
+            # （-9999 のまま pyxel.tri に渡すとクリップ処理が重い）
+            if v0[2] <= 0 or v1[2] <= 0 or v2[2] <= 0:
+                continue
+
+            # 画面外の面を捨てる
+            x0, y0 = proj_pts[i0]
+            x1, y1 = proj_pts[i1]
+            x2, y2 = proj_pts[i2]
+            mnx = x0 if x0 < x1 else x1
+            mnx = mnx if mnx < x2 else x2
+            mxx = x0 if x0 > x1 else x1
+            mxx = mxx if mxx > x2 else x2
+            mny = y0 if y0 < y1 else y1
+            mny = mny if mny < y2 else y2
+            mxy = y0 if y0 > y1 else y1
+            mxy = mxy if mxy > y2 else y2
+            if mxx < 0 or mnx >= w or mxy < 0 or mny >= h:
+                continue
+
+            # 面積がほぼ 0 の面（画面上で潰れた三角形）も捨てる
+            area = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+            if abs(area) < 1:
                 continue
 
             depth = (v0[2] + v1[2] + v2[2]) / 3.0
@@ -59,7 +152,7 @@ class HiddenLineRenderer:
             nz = ux * vy - uy * vx
 
             # カメラ空間の法線（向きだけ必要）
-            n_len = math.sqrt(nx * nx + ny * ny + nz * nz)
+            n_len = sqrt(nx * nx + ny * ny + nz * nz)
             if n_len == 0:
                 continue
             nx /= n_len
@@ -74,15 +167,32 @@ class HiddenLineRenderer:
                 + nz * self.light_dir[2],
             )
 
-            intensity = math.sqrt(intensity)
+            intensity = sqrt(intensity)
 
             face_info.append((depth, nz, intensity, (i0, i1, i2)))
 
-        # 奥 → 手前ソート
-        face_info.sort(key=lambda x: x[0], reverse=True)
-
-        # 5. 描画
-        for depth, nz, intensity, (i0, i1, i2) in face_info:
+        # 手前 → 奥ソート
+        face_info.sort(key=lambda x: x[0])
+
+        # 塗りつぶし時は手前から被覆を調べ、完全に隠れる面を捨てる
+        # （陰線も描くワイヤー表示では全部の面が必要）
+        # pyxel.tri 自体が速いので、重なりの多いシーン向けのオプション
+        if self.cull_occluded and not self.wired and HAS_NUMBA:
+            self.coverage.fill(False)
+            tri_xy = np.array(
+                [
+                    proj_pts[i0] + proj_pts[i1] + proj_pts[i2]
+                    for _, _, _, (i0, i1, i2) in face_info
+                ],
+                dtype=np.float64,
+            ).reshape(-1, 6)
+            visible = _visible_faces(self.coverage, tri_xy)
+            face_info = [info for info, v in zip(face_info, visible) if v]
+
+        # 4. 描画（奥 → 手前）
+        line = pyxel.line
+        tri = pyxel.tri
+        for depth, nz, intensity, (i0, i1, i2) in reversed(face_info):
             x0, y0 = proj_pts[i0]
             x1, y1 = proj_pts[i1]
             x2, y2 = proj_pts[i2]
@@ -90,25 +200,28 @@ class HiddenLineRenderer:
             if self.wired:
                 # 輪郭線: 表は白、陰線は暗い色
                 if nz <= 0:
-                    pyxel.line(x0, y0, x1, y1, 7)
-                    pyxel.line(x1, y1, x2, y2, 7)
-                    pyxel.line(x2, y2, x0, y0, 7)
+                    line(x0, y0, x1, y1, 7)
+                    line(x1, y1, x2, y2, 7)
+                    line(x2, y2, x0, y0, 7)
                 else:
-                    pyxel.line(x0, y0, x1, y1, 1)
-                    pyxel.line(x1, y1, x2, y2, 1)
-                    pyxel.line(x2, y2, x0, y0, 1)
+                    line(x0, y0, x1, y1, 1)
+                    line(x1, y1, x2, y2, 1)
+                    line(x2, y2, x0, y0, 1)
             else:
                 # ------ フラットシェーディングによる塗り ------
                 # 三角形
                 if self.shade:
                     shade = self.base_color - int(intensity * self.shade_levels)
-                    shade = max(0, min(15, shade))
+                    if shade < 0:
+                        shade = 0
+                    elif shade > 15:
+                        shade = 15
                 else:
                     shade = 7
-                pyxel.tri(x0, y0, x1, y1, x2, y2, shade)
+                tri(x0, y0, x1, y1, x2, y2, shade)
 
                 # 輪郭線を描く（陰線は描かない）
                 if nz <= 0:
-                    pyxel.line(x0, y0, x1, y1, 0)
-                    pyxel.line(x1, y1, x2, y2, 0)
-                    pyxel.line(x2, y2, x0, y0, 0)
+                    line(x0, y0, x1, y1, 0)
+                    line(x1, y1, x2, y2, 0)
+                    line(x2, y2, x0, y0, 0)
@@ -1,11 +1,165 @@
 import math
+import numpy as np
 import pyxel
-from threed import Camera, Mesh
-import random
+from threed import HAS_NUMBA, Camera, Mesh, njit, prange, screen_buffer
+
+
+def _bayer16():
+    """16x16 の Bayer 行列（0〜255 の並べ替え）"""
+    m = np.zeros((1, 1), dtype=np.int32)
+    while m.shape[0] < 16:
+        m = np.block([[4 * m, 4 * m + 2], [4 * m + 3, 4 * m + 1]])
+    return m
+
+
+@njit(cache=True)
+def _edge_span(e, a, lo, hi):
+    """辺関数 e + a * i >= 0 を満たす i の範囲で [lo, hi] を狭める"""
+    if a > 0:
+        lo = max(lo, int(math.ceil(-e / a)) - 1)
+    elif a < 0:
+        hi = min(hi, int(math.floor(e / -a)) + 1)
+    elif e < 0:
+        hi = lo - 1
+    return lo, hi
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _phong_fill_kernel(
+    min_x,
+    max_x,
+    min_y,
+    max_y,
+    x0,
+    y0,
+    x1,
+    y1,
+    x2,
+    y2,
+    z0,
+    z1,
+    z2,
+    nx0,
+    ny0,
+    nz0,
+    nx1,
+    ny1,
+    nz1,
+    nx2,
+    ny2,
+    nz2,
+    denom,
+    zbuf,
+    out,
+    ox,
+    oy,
+    lx,
+    ly,
+    lz,
+    ambient,
+    diffuse,
+    specular,
+    shininess,
+    shade_levels,
+    dithering,
+    dither,
+):
+    """
+    バウンディングボックス内を 1 行ずつ並列にラスタライズする。
+    描いたピクセルの階調を out[y - oy, x - ox] に書き込む
+    （画面バッファなら ox = oy = 0、バウンディングボックス分のタイルなら
+    ox = min_x, oy = min_y として -1 で初期化しておく）。
 
+    各行では 3 辺の辺関数から三角形内部の x 範囲を先に求め、
+    その範囲だけを辺関数の加算（x 方向の増分）で歩く。
+    """
+    # 辺関数 e0, e1 とその x 方向の増分 a0, a1
+    # 逆回りの三角形（denom < 0）は符号を反転して内側を正に揃える
+    sgn = 1.0 if denom > 0 else -1.0
+    area = denom * sgn
+    inv_area = 1.0 / area
+    a0 = (y1 - y2) * sgn
+    b0 = (x2 - x1) * sgn
+    a1 = (y2 - y0) * sgn
+    b1 = (x0 - x2) * sgn
+    a2 = -a0 - a1
+
+    for y in prange(min_y, max_y + 1):
+        yy = y + 0.5
+        xx = min_x + 0.5
+
+        # 行の左端での辺関数
+        e0 = a0 * (xx - x2) + b0 * (yy - y2)
+        e1 = a1 * (xx - x2) + b1 * (yy - y2)
+        e2 = area - e0 - e1
+
+        # 3 辺とも非負になる範囲（丸め誤差を考えて 1 ピクセル広めに取る）
+        lo = 0
+        hi = max_x - min_x
+        lo, hi = _edge_span(e0, a0, lo, hi)
+        lo, hi = _edge_span(e1, a1, lo, hi)
+        lo, hi = _edge_span(e2, a2, lo, hi)
+
+        e0 += a0 * lo
+        e1 += a1 * lo
+        entered = False
+        for x in range(min_x + lo, min_x + hi + 1):
+            # barycentric
+            w0 = e0 * inv_area
+            w1 = e1 * inv_area
+            w2 = 1.0 - w0 - w1
+            e0 += a0
+            e1 += a1
+            if w0 < 0 or w1 < 0 or w2 < 0:
+                # 内部を通り過ぎたらこの行は終わり
+                if entered:
+                    break
+                continue
+            entered = True
 
-def hash01(x: int, y: int) -> float:
-    return (((x * 73856093) ^ (y * 19349663)) & 0xFF) / 255.0
+            # depth
+            z = w0 * z0 + w1 * z1 + w2 * z2
+            if z <= 0:
+                continue
+            if z >= zbuf[y, x]:
+                continue
+            zbuf[y, x] = z
+
+            # 法線補間 + normalize
+            nx = w0 * nx0 + w1 * nx1 + w2 * nx2
+            ny = w0 * ny0 + w1 * ny1 + w2 * ny2
+            nz = w0 * nz0 + w1 * nz1 + w2 * nz2
+            length = math.sqrt(nx * nx + ny * ny + nz * nz)
+            if length > 0:
+                nx /= length
+                ny /= length
+                nz /= length
+            else:
+                nx, ny, nz = 0.0, 0.0, 1.0
+
+            # 光強度（PhongRenderer.phong_intensity と同じ式）
+            diff = nx * lx + ny * ly + nz * lz
+            if diff < 0:
+                diff = 0.0
+            spec = 0.0
+            if diff > 0:
+                vr = 2 * diff * nz - lz
+                if vr > 0:
+                    spec = (vr**shininess) * specular
+            c = ambient + diff * diffuse + spec
+            c = max(0.0, min(1.0, c))
+
+            if dithering:
+                # 階調を 8bit 小数の固定小数点にして整数のまま比較する
+                v = int(c * ((shade_levels - 1) * 256))
+                s0 = v >> 8
+                if dither[y & 15, x & 15] < (v & 0xFF):
+                    shade = min(s0 + 1, shade_levels - 1)
+                else:
+                    shade = s0
+            else:
+                shade = int(c * (shade_levels - 1))
+            out[y - oy, x - ox] = shade
 
 
 class PhongRenderer:
@@ -37,6 +191,9 @@ class PhongRenderer:
         self.dithering = dithering
         self.highlighting = highlighting
 
+        # ディザのしきい値（16x16 Bayer 行列、0〜255 の整数）
+        self.dither = _bayer16().astype(np.uint8)
+
         # 画面サイズ
         if hasattr(camera, "screen_w"):
             self.width = camera.screen_w
@@ -50,48 +207,40 @@ class PhongRenderer:
         L = math.sqrt(lx * lx + ly * ly + lz * lz) or 1.0
         self.light_dir = (lx / L, ly / L, lz / L)
 
+        # 描画先の画面バッファ（draw_mesh ごとに取り直す）
+        self.screen = None
+
+        # フレームごとの作業用配列（頂点数ごとに作って使い回す）
+        self._scratch = {}
+
         # Z buffer
         self.z_far = 1e9
-        self.zbuf = [[self.z_far] * self.width for _ in range(self.height)]
+        self.zbuf = np.full((self.height, self.width), self.z_far, dtype=np.float32)
 
     # -----------------------------
     # フレーム開始時に呼ぶ（Zバッファ初期化）
     # -----------------------------
     def clear_zbuffer(self):
-        zf = self.z_far
-        for y in range(self.height):
-            row = self.zbuf[y]
-            for x in range(self.width):
-                row[x] = zf
+        self.zbuf.fill(self.z_far)
 
     # -----------------------------
     # ピクセル単位 Phong シェーディング（0〜1）
+    # nx, ny, nz はスカラーでも ndarray でもよい
     # -----------------------------
     def phong_intensity(self, nx, ny, nz):
         lx, ly, lz = self.light_dir
 
         # Lambert（拡散）
-        diff = nx * lx + ny * ly + nz * lz
-        if diff < 0:
-            diff = 0.0
+        diff = np.maximum(nx * lx + ny * ly + nz * lz, 0.0)
 
         # 反射ベクトルを作る必要はない
         # カメラ空間では eye = (0,0,1) として簡略化できる
-        view_z = 1.0
-        spec = 0.0
-        if diff > 0:
-            # R = 2(N·L)N - L  （省略形）
-            rx = 2 * diff * nx - lx
-            ry = 2 * diff * ny - ly
-            rz = 2 * diff * nz - lz
-
-            # V·R（視線方向は (0,0,1)）
-            vr = rz
-            if vr > 0:
-                spec = (vr**self.shininess) * self.specular
-
-        i = self.ambient + diff * self.diffuse + spec
-        return max(0.0, min(1.0, i))
+        # R = 2(N·L)N - L  （省略形）、V·R（視線方向は (0,0,1)）は rz のみ
+        vr = 2 * diff * nz - lz
+        spec = np.where(diff > 0, np.maximum(vr, 0.0) ** self.shininess, 0.0)
+
+        i = self.ambient + diff * self.diffuse + spec * self.specular
+        return np.clip(i, 0.0, 1.0)
 
     # -----------------------------
     # バリセントリック + Zバッファ + Phong
@@ -101,86 +250,200 @@ class PhongRenderer:
         (x1, y1) = p1
         (x2, y2) = p2
 
-        denom = (y1 - y2) * (x0 - x2) + (x2 - x1) * (y0 - y2)
+        # 符号付き面積の 2 倍
+        denom = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
         if denom == 0:
             return
         inv_denom = 1.0 / denom
 
         w = self.width
         h = self.height
-        zbuf = self.zbuf
 
-        # bounding box
-        min_x = max(int(min(x0, x1, x2)), 0)
-        max_x = min(int(max(x0, x1, x2)), w - 1)
-        min_y = max(int(min(y0, y1, y2)), 0)
-        max_y = min(int(max(y0, y1, y2)), h - 1)
+        # bounding box（3 引数の min/max は遅いので比較で書く）
+        min_x = x0 if x0 < x1 else x1
+        min_x = int(min_x if min_x < x2 else x2)
+        max_x = x0 if x0 > x1 else x1
+        max_x = int(max_x if max_x > x2 else x2)
+        min_y = y0 if y0 < y1 else y1
+        min_y = int(min_y if min_y < y2 else y2)
+        max_y = y0 if y0 > y1 else y1
+        max_y = int(max_y if max_y > y2 else y2)
+        if min_x < 0:
+            min_x = 0
+        if max_x > w - 1:
+            max_x = w - 1
+        if min_y < 0:
+            min_y = 0
+        if max_y > h - 1:
+            max_y = h - 1
 
         if min_x > max_x or min_y > max_y:
             return
 
+        screen = self.screen
+
+        if HAS_NUMBA:
+            # JIT 版カーネルで行ごとに並列ラスタライズ
+            # 画面バッファがあればそこへ直接書き込む
+            if screen is not None:
+                out, ox, oy = screen, 0, 0
+            else:
+                out = np.full((max_y - min_y + 1, max_x - min_x + 1), -1, np.int32)
+                ox, oy = min_x, min_y
+            lx, ly, lz = self.light_dir
+            _phong_fill_kernel(
+                min_x,
+                max_x,
+                min_y,
+                max_y,
+                x0,
+                y0,
+                x1,
+                y1,
+                x2,
+                y2,
+                z0,
+                z1,
+                z2,
+                *n0,
+                *n1,
+                *n2,
+                denom,
+                self.zbuf,
+                out,
+                ox,
+                oy,
+                lx,
+                ly,
+                lz,
+                self.ambient,
+                self.diffuse,
+                self.specular,
+                self.shininess,
+                self.shade_levels,
+                self.dithering,
+                self.dither,
+            )
+            if screen is not None:
+                return
+            iy, ix = np.nonzero(out >= 0)
+            px = ix + min_x
+            py = iy + min_y
+            shade = out[iy, ix]
+        else:
+            tile = self._shade_tile(
+                min_x,
+                max_x,
+                min_y,
+                max_y,
+                p0,
+                z0,
+                n0,
+                p1,
+                z1,
+                n1,
+                p2,
+                z2,
+                n2,
+                inv_denom,
+            )
+            if tile is None:
+                return
+            px, py, shade = tile
+            if screen is not None:
+                screen[py, px] = shade
+                return
+
+        pset = pyxel.pset
+        for x, y, s in zip(px.tolist(), py.tolist(), shade.tolist()):
+            pset(x, y, s)
+
+    # -----------------------------
+    # Numba が無い場合の NumPy 版
+    # バウンディングボックス全体を ndarray でまとめて計算し、
+    # 描画するピクセルの (x, y, shade) を返す
+    # -----------------------------
+    def _shade_tile(
+        self, min_x, max_x, min_y, max_y, p0, z0, n0, p1, z1, n1, p2, z2, n2, inv_denom
+    ):
+        (x0, y0) = p0
+        (x1, y1) = p1
+        (x2, y2) = p2
+
         # 頂点法線
         nx0, ny0, nz0 = n0
         nx1, ny1, nz1 = n1
         nx2, ny2, nz2 = n2
 
-        for y in range(min_y, max_y + 1):
-            yy = y + 0.5
-            for x in range(min_x, max_x + 1):
-                xx = x + 0.5
-
-                # barycentric
-                w0 = ((y1 - y2) * (xx - x2) + (x2 - x1) * (yy - y2)) * inv_denom
-                if w0 < 0:
-                    continue
-                w1 = ((y2 - y0) * (xx - x2) + (x0 - x2) * (yy - y2)) * inv_denom
-                if w1 < 0:
-                    continue
-                w2 = 1.0 - w0 - w1
-                if w2 < 0:
-                    continue
-
-                # depth
-                z = w0 * z0 + w1 * z1 + w2 * z2
-                if z <= 0:
-                    continue
-
-                if z >= zbuf[y][x]:
-                    continue
-                zbuf[y][x] = z
-
-                # 法線補間（Phong の本質）
-                nx = w0 * nx0 + w1 * nx1 + w2 * nx2
-                ny = w0 * ny0 + w1 * ny1 + w2 * ny2
-                nz = w0 * nz0 + w1 * nz1 + w2 * nz2
-
-                # normalize
-                length = math.sqrt(nx * nx + ny * ny + nz * nz)
-                if length > 0:
-                    nx /= length
-                    ny /= length
-                    nz /= length
-                else:
-                    nx, ny, nz = 0, 0, 1
-
-                # 光強度
-                c = self.phong_intensity(nx, ny, nz)
+        # ピクセル中心 (x+0.5, y+0.5) のグリッド
+        xs = np.arange(min_x, max_x + 1) + 0.5
+        ys = np.arange(min_y, max_y + 1) + 0.5
+        X, Y = np.meshgrid(xs, ys)
+
+        # barycentric
+        w0 = ((y1 - y2) * (X - x2) + (x2 - x1) * (Y - y2)) * inv_denom
+        w1 = ((y2 - y0) * (X - x2) + (x0 - x2) * (Y - y2)) * inv_denom
+        w2 = 1.0 - w0 - w1
+        mask = (w0 >= 0) & (w1 >= 0) & (w2 >= 0)
+
+        # depth
+        z = w0 * z0 + w1 * z1 + w2 * z2
+        zbuf = self.zbuf[min_y : max_y + 1, min_x : max_x + 1]
+        mask &= (z > 0) & (z < zbuf)
+        if not mask.any():
+            return None
+        zbuf[mask] = z[mask]
+
+        # 以降は描画するピクセルだけ計算する
+        w0 = w0[mask]
+        w1 = w1[mask]
+        w2 = w2[mask]
+
+        # 法線補間（Phong の本質）
+        nx = w0 * nx0 + w1 * nx1 + w2 * nx2
+        ny = w0 * ny0 + w1 * ny1 + w2 * ny2
+        nz = w0 * nz0 + w1 * nz1 + w2 * nz2
+
+        # normalize（長さ 0 は (0,0,1) 扱い）
+        length = np.sqrt(nx * nx + ny * ny + nz * nz)
+        valid = length > 0
+        inv_len = np.reciprocal(np.where(valid, length, 1.0))
+        nx = np.where(valid, nx * inv_len, 0.0)
+        ny = np.where(valid, ny * inv_len, 0.0)
+        nz = np.where(valid, nz * inv_len, 1.0)
+
+        # 光強度
+        c = self.phong_intensity(nx, ny, nz)
+
+        iy, ix = np.nonzero(mask)
+        px = ix + min_x
+        py = iy + min_y
+
+        if self.dithering:
+            # 階調を 8bit 小数の固定小数点にして整数のまま比較する
+            v = (c * ((self.shade_levels - 1) * 256)).astype(np.int32)
+            s0 = v >> 8
+
+            # 小数部がしきい値を超えたら 1 上の色を選ぶ（組織的ディザ）
+            shade = np.where(
+                self.dither[py & 15, px & 15] < (v & 0xFF),
+                np.minimum(s0 + 1, self.shade_levels - 1),
+                s0,
+            )
 
-                if self.dithering:
-                    v = c * (self.shade_levels - 1)
-                    s0 = int(v)
-                    frac = v - s0
+        else:
+            shade = (c * (self.shade_levels - 1)).astype(np.int32)
 
-                    # frac の確率で 1 上の色を選ぶ
-                    # if random.random() < frac:
-                    if hash01(x, y) < frac:
-                        shade = min(s0 + 1, self.shade_levels - 1)
-                    else:
-                        shade = s0
+        return px, py, shade
 
-                else:
-                    shade = int(c * (self.shade_levels - 1))
-                pyxel.pset(x, y, shade)
+    # -----------------------------
+    # draw_mesh の作業用配列（頂点数 n ごとに 1 組）
+    # -----------------------------
+    def _scratch_buffers(self, n):
+        bufs = self._scratch.get(n)
+        if bufs is None:
+            bufs = self._scratch[n] = (np.empty((n, 3)), np.empty((n, 3)))
+        return bufs
 
     # -----------------------------
     # メッシュメイン描画
@@ -188,63 +451,45 @@ class PhongRenderer:
     def draw_mesh(self, mesh):
         cam = self.camera
 
-        # ローカル → ワールド → カメラ
-        cam_pts = []
-        for x, y, z in mesh.points:
-            wx, wy, wz = mesh.local_to_world(x, y, z)
-            cx, cy, cz = cam.world_to_camera(wx, wy, wz)
-            cam_pts.append((cx, cy, cz))
-
-        # 投影
-        proj = [None] * len(cam_pts)
-        for i, (x, y, z) in enumerate(cam_pts):
-            if z <= 0:
-                proj[i] = None
-            else:
-                sx, sy = cam.project(x, y, z)
-                proj[i] = (float(sx), float(sy), float(z))
-
-        # 頂点法線（カメラ座標系で）
-        vnorm = [(0.0, 0.0, 0.0) for _ in mesh.points]
+        # 描画先の画面バッファ（サイズが合わなければ pset で描く）
+        self.screen = screen_buffer(pyxel.screen)
+        if self.screen is not None and self.screen.shape != self.zbuf.shape:
+            self.screen = None
 
-        for i0, i1, i2 in mesh.faces:
-            v0 = cam_pts[i0]
-            v1 = cam_pts[i1]
-            v2 = cam_pts[i2]
+        # ローカル → ワールド → カメラ（(N, 3) 配列で一括変換）
+        MV = cam.get_model_view_matrix(mesh.get_model_matrix())
+        cam_np, vnorm = self._scratch_buffers(len(mesh.points_np))
+        np.matmul(mesh.points_np, MV[:3, :3].T, out=cam_np)
+        cam_np += MV[:3, 3]
 
-            ux, uy, uz = (v1[0] - v0[0], v1[1] - v0[1], v1[2] - v0[2])
-            vx, vy, vz = (v2[0] - v0[0], v2[1] - v0[1], v2[2] - v0[2])
-
-            nx = uy * vz - uz * vy
-            ny = uz * vx - ux * vz
-            nz = ux * vy - uy * vx
+        # 投影
+        sx, sy, in_front = cam.project_many(cam_np)
+        sx = sx.astype(np.float64).tolist()
+        sy = sy.astype(np.float64).tolist()
+        sz = cam_np[:, 2].tolist()
 
-            for idx in (i0, i1, i2):
-                px, py, pz = vnorm[idx]
-                vnorm[idx] = (px + nx, py + ny, pz + nz)
+        # カメラ前方の頂点だけでできた面を一括で選ぶ
+        faces = mesh.faces_np[in_front[mesh.faces_np].all(axis=1)]
 
-        # 正規化
-        for i, (nx, ny, nz) in enumerate(vnorm):
-            L = math.sqrt(nx * nx + ny * ny + nz * nz)
-            if L > 0:
-                vnorm[i] = (nx / L, ny / L, nz / L)
-            else:
-                vnorm[i] = (0, 0, 1)
+        # 頂点法線（カメラ座標系で）
+        # ローカル座標で求めておいた法線を同じ model-view で回転するだけ。
+        # 回転 + 一様スケールなので長さはピクセルごとの正規化で吸収される
+        np.matmul(mesh.local_normals_np, MV[:3, :3].T, out=vnorm)
+        vnorm = vnorm.tolist()
 
         # Zバッファ使用なのでソート不要
-        for i0, i1, i2 in mesh.faces:
-            if proj[i0] is None or proj[i1] is None or proj[i2] is None:
-                continue
-
-            (x0, y0, z0) = proj[i0]
-            (x1, y1, z1) = proj[i1]
-            (x2, y2, z2) = proj[i2]
+        # ループ内で使うメソッドはローカルに束縛しておく
+        draw_triangle = self._draw_triangle
+        for i0, i1, i2 in faces.tolist():
+            (x0, y0, z0) = (sx[i0], sy[i0], sz[i0])
+            (x1, y1, z1) = (sx[i1], sy[i1], sz[i1])
+            (x2, y2, z2) = (sx[i2], sy[i2], sz[i2])
 
             n0 = vnorm[i0]
             n1 = vnorm[i1]
             n2 = vnorm[i2]
 
-            self._draw_triangle(
+            draw_triangle(
                 (x0, y0),
                 z0,
                 n0,
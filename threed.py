@@ -1,4 +1,22 @@
 import math
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    HAS_NUMBA = True
+except ImportError:
+    # Numba が無い環境（Web 版など）では素の Python 関数のまま使う
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda f: f
+
+    prange = range
 
 
 class Camera:
@@ -39,6 +57,14 @@ class Camera:
         self.cy = screen_h // 2
         self.scale = scale
 
+        # ビュー行列のキャッシュ（姿勢が変わったときだけ作り直す）
+        self._view_matrix = None
+        self._view_key = None
+
+        # 投影行列のキャッシュ（画面中心・倍率が変わったときだけ作り直す）
+        self._proj_matrix = None
+        self._proj_key = None
+
     # ---------------------------------------
     # look_at: カメラを指定ターゲットに向ける
     # ---------------------------------------
@@ -69,6 +95,34 @@ class Camera:
         # カメラ回転を適用
         return rotate_xyz_fast(x, y, z, self.rx, self.ry, self.rz)
 
+    # ---------------------------------------
+    # 世界座標 → カメラ座標 の 4x4 行列
+    # ---------------------------------------
+    def get_view_matrix(self):
+        key = (self.rx, self.ry, self.rz, self.tx, self.ty, self.tz)
+        if key != self._view_key:
+            R = rotation_matrix(self.rx, self.ry, self.rz)
+            M = np.eye(4)
+            M[:3, :3] = R
+            M[:3, 3] = -R @ (self.tx, self.ty, self.tz)
+            self._view_matrix = M
+            self._view_key = key
+        return self._view_matrix
+
+    # ---------------------------------------
+    # ローカル座標 (N, 3) → カメラ座標 (N, 3)
+    # ---------------------------------------
+    def transform_points(self, model_matrix, points_np):
+        # model-view を 1 回だけ合成して全頂点に適用
+        MV = self.get_model_view_matrix(model_matrix)
+        return points_np @ MV[:3, :3].T + MV[:3, 3]
+
+    # ---------------------------------------
+    # ローカル座標 → カメラ座標 の 4x4 行列
+    # ---------------------------------------
+    def get_model_view_matrix(self, model_matrix):
+        return self.get_view_matrix() @ model_matrix
+
     # ---------------------------------------
     # カメラ座標 → 投影座標（画面座標）
     # ---------------------------------------
@@ -77,6 +131,37 @@ class Camera:
         sy = y / z
         return (int(self.cx + sx * self.scale), int(self.cy - sy * self.scale))
 
+    # ---------------------------------------
+    # カメラ座標 → 同次画面座標 の 3x3 行列
+    # (x, y, z) → (scale*x + cx*z, -scale*y + cy*z, z)。z で割ると画面座標
+    # ---------------------------------------
+    def get_projection_matrix(self):
+        key = (self.cx, self.cy, self.scale)
+        if key != self._proj_key:
+            self._proj_matrix = np.array(
+                [
+                    [self.scale, 0.0, self.cx],
+                    [0.0, -self.scale, self.cy],
+                    [0.0, 0.0, 1.0],
+                ]
+            )
+            self._proj_key = key
+        return self._proj_matrix
+
+    # ---------------------------------------
+    # カメラ座標 (N, 3) → 投影座標（まとめて）
+    # 返り値: sx, sy（int32）, カメラ前方にある点のマスク
+    # ---------------------------------------
+    def project_many(self, cam_pts_np):
+        # 投影行列を 1 回掛けてから z で割る
+        uvw = cam_pts_np @ self.get_projection_matrix().T
+        z = uvw[:, 2]
+        mask = z > 0
+        inv_z = 1.0 / np.where(mask, z, 1.0)
+        sx = (uvw[:, 0] * inv_z).astype(np.int32)
+        sy = (uvw[:, 1] * inv_z).astype(np.int32)
+        return sx, sy, mask
+
 
 class Mesh:
     def __init__(
@@ -92,10 +177,21 @@ class Mesh:
         rz=0,
         scale=1.0,
     ):
-        self.points = points or []
-        self.segments = segments or []
-        self.faces = faces or []
-        self.vertex_normals = compute_vertex_normals(points)
+        # list でも ndarray でも受け付ける
+        self.points = points if points is not None else []
+        self.segments = segments if segments is not None else []
+        self.faces = faces if faces is not None else []
+        self.vertex_normals = compute_vertex_normals(self.points)
+
+        # 一括変換用の (N, 3) 頂点配列と (F, 3) 面インデックス配列
+        self.points_np = np.asarray(self.points, dtype=np.float32).reshape(-1, 3)
+        self.faces_np = np.asarray(self.faces, dtype=np.int32).reshape(-1, 3)
+        self.local_normals_np = compute_face_vertex_normals(
+            self.points_np, self.faces_np
+        )
+        self.vertex_normals_np = np.asarray(
+            self.vertex_normals, dtype=np.float64
+        ).reshape(-1, 3)
 
         # ローカル変換
         self.tx = tx
@@ -108,6 +204,13 @@ class Mesh:
 
         self.scale = scale
 
+        # モデル行列のキャッシュ（姿勢が変わったときだけ作り直す）
+        self._cached_model_matrix = None
+        self._model_key = None
+
+        # faces から作る辺の一覧（形状は変わらないので初回だけ作る）
+        self._edges = None
+
     # ------------------------------------------------
     # ローカル座標 → ワールド座標
     # ------------------------------------------------
@@ -124,13 +227,41 @@ class Mesh:
         return (x + self.tx, y + self.ty, z + self.tz)
 
     # ------------------------------------------------
-    # メッシュ全体をワールド座標へ変換
+    # ローカル座標 → ワールド座標 の 4x4 行列
+    # ------------------------------------------------
+    def get_model_matrix(self):
+        key = (self.rx, self.ry, self.rz, self.scale, self.tx, self.ty, self.tz)
+        if key != self._model_key:
+            M = np.eye(4)
+            M[:3, :3] = rotation_matrix(self.rx, self.ry, self.rz) * self.scale
+            M[:3, 3] = (self.tx, self.ty, self.tz)
+            self._cached_model_matrix = M
+            self._model_key = key
+        return self._cached_model_matrix
+
+    # ------------------------------------------------
+    # faces の各辺を重複なしで並べた (E, 2) 配列
+    # ------------------------------------------------
+    def get_edges(self):
+        if self._edges is None:
+            f = self.faces_np
+            a = f.ravel()
+            b = f[:, [1, 2, 0]].ravel()
+
+            # (小さい番号, 大きい番号) を 1 つの整数にまとめて重複を除く
+            # （行単位の np.unique より 1 次元の np.unique の方がずっと速い）
+            n = np.int64(len(self.points_np))
+            keys = np.minimum(a, b) * n + np.maximum(a, b)
+            keys = np.unique(keys)
+            self._edges = np.stack([keys // n, keys % n], axis=1).astype(np.int32)
+        return self._edges
+
+    # ------------------------------------------------
+    # メッシュ全体をワールド座標へ変換（(N, 3) 配列）
     # ------------------------------------------------
     def transformed_points(self):
-        out = []
-        for x, y, z in self.points:
-            out.append(self.local_to_world(x, y, z))
-        return out
+        M = self.get_model_matrix()
+        return self.points_np @ M[:3, :3].T + M[:3, 3]
 
 
 def rotate_xyz(X: int, Y: int, Z: int, RX: int, RY: int, RZ: int):
@@ -170,7 +301,61 @@ def rotate_xyz(X: int, Y: int, Z: int, RX: int, RY: int, RZ: int):
     return X1, Y1, Z1
 
 
-rotate_xyz_fast = rotate_xyz
+@lru_cache(maxsize=16)
+def _cos_sin(deg):
+    # 同じ角度が全頂点で繰り返し使われるので三角関数をキャッシュする
+    rad = deg * math.pi / 180
+    return math.cos(rad), math.sin(rad)
+
+
+def rotate_x(X, Y, Z, RX):
+    """rotate_xyz で RY = RZ = 0 の場合（X 軸回りの回転だけ）"""
+    C, S = _cos_sin(RX)
+    return X, Y * C - Z * S, Y * S + Z * C
+
+
+def rotate_y(X, Y, Z, RY):
+    """rotate_xyz で RX = RZ = 0 の場合（Y 軸回りの回転だけ）"""
+    C, S = _cos_sin(RY)
+    return X * C + Z * S, Y, Z * C - X * S
+
+
+def rotate_z(X, Y, Z, RZ):
+    """rotate_xyz で RX = RY = 0 の場合（Z 軸回りの回転だけ）"""
+    C, S = _cos_sin(RZ)
+    return X * C - Y * S, X * S + Y * C, Z
+
+
+def rotate_xyz_fast(X, Y, Z, RX, RY, RZ):
+    """
+    rotate_xyz と同じ結果を返す。
+    回転軸が 1 つだけのときは 2x2 の回転（4 乗算 + 2 加算）で済ませる。
+    """
+    if RX == 0 and RZ == 0:
+        return rotate_y(X, Y, Z, RY)
+    if RY == 0 and RZ == 0:
+        return rotate_x(X, Y, Z, RX)
+    if RX == 0 and RY == 0:
+        return rotate_z(X, Y, Z, RZ)
+    return rotate_xyz(X, Y, Z, RX, RY, RZ)
+
+
+def rotation_matrix(RX, RY, RZ):
+    """
+    rotate_xyz と同じ回転を 3x3 行列（ndarray）として返す。
+    頂点配列 P (N, 3) には P @ R.T で一括適用できる。
+    """
+    CRX, SRX = math.cos(math.radians(RX)), math.sin(math.radians(RX))
+    CRY, SRY = math.cos(math.radians(RY)), math.sin(math.radians(RY))
+    CRZ, SRZ = math.cos(math.radians(RZ)), math.sin(math.radians(RZ))
+
+    return np.array(
+        [
+            [CRY * CRZ, SRX * SRY * CRZ - CRX * SRZ, CRX * SRY * CRZ + SRX * SRZ],
+            [CRY * SRZ, SRX * SRY * SRZ + CRX * CRZ, CRX * SRY * SRZ - SRX * CRZ],
+            [-SRY, SRX * CRY, CRX * CRY],
+        ]
+    )
 
 
 def clip_segment(
@@ -250,7 +435,24 @@ def clip_segment(
         return 1, X0, Y0, Z0, X1, Y1, Z1
 
 
-clip_segment_fast = clip_segment
+# Numba があれば JIT 版を使う（無ければ Python 版のまま）
+# クリップ後の点は視野境界ちょうどに乗るので、領域コードの判定が
+# 変わらないよう fastmath は使わない
+if HAS_NUMBA:
+    clip_segment_fast = njit(cache=True)(clip_segment)
+else:
+    clip_segment_fast = clip_segment
+
+
+def screen_buffer(image):
+    """
+    pyxel.Image の画素を (height, width) の uint8 ndarray として直接参照する。
+    書き込みはそのまま画面に反映される。
+    data_ptr を持たない古い pyxel では None を返す（呼び出し側は pset で描く）。
+    """
+    if not hasattr(image, "data_ptr"):
+        return None
+    return np.ctypeslib.as_array(image.data_ptr()).reshape(image.height, image.width)
 
 
 def normalize(v):
@@ -261,44 +463,43 @@ def normalize(v):
     return (x / d, y / d, z / d)
 
 
-# def compute_vertex_normals(points, faces):
-#     normals = [(0.0, 0.0, 0.0) for _ in points]
-
-#     for i0, i1, i2 in faces:
-#         p0 = points[i0]
-#         p1 = points[i1]
-#         p2 = points[i2]
+def compute_face_vertex_normals(points_np, faces_np):
+    """
+    各頂点に接する面の法線を足し合わせて正規化した頂点法線を (N, 3) で返す。
+    面の向き（頂点の並び順）に従うので球以外のメッシュにも使える。
+    """
+    P = points_np.astype(np.float64)
+    p0 = P[faces_np[:, 0]]
+    p1 = P[faces_np[:, 1]]
+    p2 = P[faces_np[:, 2]]
 
-#         # face normal
-#         ux, uy, uz = (p1[0]-p0[0], p1[1]-p0[1], p1[2]-p0[2])
-#         vx, vy, vz = (p2[0]-p0[0], p2[1]-p0[1], p2[2]-p0[2])
-#         nx = uy*vz - uz*vy
-#         ny = uz*vx - ux*vz
-#         nz = ux*vy - uy*vx
+    # face normal
+    fn = np.cross(p1 - p0, p2 - p0)
 
-#         # accumulate
-#         for idx in (i0, i1, i2):
-#             nx0, ny0, nz0 = normals[idx]
-#             normals[idx] = (nx0+nx, ny0+ny, nz0+nz)
+    # accumulate
+    normals = np.zeros_like(P)
+    for k in range(3):
+        np.add.at(normals, faces_np[:, k], fn)
 
-#     # normalize
-#     out = []
-#     for nx, ny, nz in normals:
-#         l = math.sqrt(nx*nx + ny*ny + nz*nz)
-#         if l == 0:
-#             out.append((0,1,0))
-#         else:
-#             out.append((nx/l, ny/l, nz/l))
-#     return out
+    # normalize
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals /= np.where(length > 0, length, 1.0)
+    normals[length[:, 0] == 0] = (0.0, 0.0, 1.0)
+    return normals.astype(np.float32)
 
 
 def compute_vertex_normals(points):
     normals = []
+
+    # ループ内で使う関数はローカルに束縛しておく
+    sqrt = math.sqrt
+    append = normals.append
+
     for x, y, z in points:
         # 頂点そのものが球面上にあるので、その方向が法線
-        length = math.sqrt(x * x + y * y + z * z)
+        length = sqrt(x * x + y * y + z * z)
         if length == 0:
-            normals.append((0, 0, 1))
+            append((0, 0, 1))
         else:
-            normals.append((x / length, y / length, z / length))
+            append((x / length, y / length, z / length))
     return normals
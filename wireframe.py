@@ -1,5 +1,6 @@
 import pyxel
 import math
+import numpy as np
 
 import time
 
@@ -20,157 +21,137 @@ def generate_sphere_mesh_with_faces(radius=1.0, lat_steps=12, lon_steps=24):
     球のメッシュ（頂点 + 三角形 faces）を生成する。
 
     返り値:
-        points: [(x, y, z), ...]
-        faces : [(i0, i1, i2), ...]    # CCW（反時計回り）で外側向き
+        points: (N, 3) の ndarray [(x, y, z), ...]
+        faces : (F, 3) の ndarray [(i0, i1, i2), ...]    # CCW（反時計回り）で外側向き
     """
 
-    points = []
-    faces = []
-
     # --------------------------------------------
     # 1. 頂点生成
     # lat: 0..lat_steps（北極→南極）
     # lon: 0..lon_steps-1（0度→360度未満）
     # --------------------------------------------
-    for lat in range(lat_steps + 1):
-        theta = math.pi * lat / lat_steps  # 0..π
-        sin_theta = math.sin(theta)
-        cos_theta = math.cos(theta)
-
-        for lon in range(lon_steps):
-            phi = 2.0 * math.pi * lon / lon_steps  # 0..2π
-            sin_phi = math.sin(phi)
-            cos_phi = math.cos(phi)
-
-            x = radius * sin_theta * cos_phi
-            y = radius * cos_theta
-            z = radius * sin_theta * sin_phi
-
-            points.append((x, y, z))
-
-    # インデックス変換
-    def idx(lat, lon):
-        return lat * lon_steps + (lon % lon_steps)
+    theta = np.linspace(0.0, np.pi, lat_steps + 1)  # 0..π
+    phi = np.linspace(0.0, 2.0 * np.pi, lon_steps, endpoint=False)  # 0..2π
+    sin_theta = np.sin(theta)[:, None]
+    cos_theta = np.cos(theta)[:, None]
+    sin_phi = np.sin(phi)[None, :]
+    cos_phi = np.cos(phi)[None, :]
+
+    x = radius * sin_theta * cos_phi
+    y = radius * cos_theta * np.ones_like(cos_phi)
+    z = radius * sin_theta * sin_phi
+    points = np.stack([x, y, z], axis=-1).reshape(-1, 3)
 
     # --------------------------------------------
     # 2. faces（三角形）生成
     #    - 各緯度帯ごとに、経度方向で quad（四角形）を2つの三角形に分割
     # --------------------------------------------
-    for lat in range(lat_steps):
-        for lon in range(lon_steps):
-            i0 = idx(lat, lon)
-            i1 = idx(lat + 1, lon)
-            i2 = idx(lat, lon + 1)
-            i3 = idx(lat + 1, lon + 1)
-
-            # Quad → 2 triangles
-            # 頂点順序は CCW（法線が外向きになる）
-            faces.append((i0, i1, i2))
-            faces.append((i2, i1, i3))
+    lat = np.arange(lat_steps)[:, None]
+    lon = np.arange(lon_steps)[None, :]
+    i0 = lat * lon_steps + lon
+    i1 = (lat + 1) * lon_steps + lon
+    i2 = lat * lon_steps + (lon + 1) % lon_steps
+    i3 = (lat + 1) * lon_steps + (lon + 1) % lon_steps
+
+    # Quad → 2 triangles
+    # 頂点順序は CCW（法線が外向きになる）
+    faces = np.stack(
+        [np.stack([i0, i1, i2], axis=-1), np.stack([i2, i1, i3], axis=-1)], axis=2
+    ).reshape(-1, 3)
 
     return points, faces
 
 
 def generate_icosphere_mesh(subdivisions=2, radius=1.0):
-    import math
-
     # --------------------------------------
     # 1. 正二十面体の初期12頂点
     # --------------------------------------
     t = (1.0 + math.sqrt(5.0)) / 2.0  # golden ratio
 
-    verts = [
-        (-1, t, 0),
-        (1, t, 0),
-        (-1, -t, 0),
-        (1, -t, 0),
-        (0, -1, t),
-        (0, 1, t),
-        (0, -1, -t),
-        (0, 1, -t),
-        (t, 0, -1),
-        (t, 0, 1),
-        (-t, 0, -1),
-        (-t, 0, 1),
-    ]
+    verts = np.array(
+        [
+            (-1, t, 0),
+            (1, t, 0),
+            (-1, -t, 0),
+            (1, -t, 0),
+            (0, -1, t),
+            (0, 1, t),
+            (0, -1, -t),
+            (0, 1, -t),
+            (t, 0, -1),
+            (t, 0, 1),
+            (-t, 0, -1),
+            (-t, 0, 1),
+        ]
+    )
 
     # normalize to radius
     def norm(v):
-        x, y, z = v
-        l = math.sqrt(x * x + y * y + z * z)
-        return (radius * x / l, radius * y / l, radius * z / l)
+        return radius * v / np.linalg.norm(v, axis=1, keepdims=True)
 
-    verts = [norm(v) for v in verts]
+    verts = norm(verts)
 
     # --------------------------------------
     # 2. 初期20面（三角形）
     # --------------------------------------
-    faces = [
-        (0, 11, 5),
-        (0, 5, 1),
-        (0, 1, 7),
-        (0, 7, 10),
-        (0, 10, 11),
-        (1, 5, 9),
-        (5, 11, 4),
-        (11, 10, 2),
-        (10, 7, 6),
-        (7, 1, 8),
-        (3, 9, 4),
-        (3, 4, 2),
-        (3, 2, 6),
-        (3, 6, 8),
-        (3, 8, 9),
-        (4, 9, 5),
-        (2, 4, 11),
-        (6, 2, 10),
-        (8, 6, 7),
-        (9, 8, 1),
-    ]
-
-    # --------------------------------------
-    # 3. midpoint キャッシュ
-    # --------------------------------------
-    midpoint_cache = {}
-
-    def midpoint(i0, i1):
-        """エッジ上の中点を生成し、キャッシュする"""
-        key = tuple(sorted((i0, i1)))
-        if key in midpoint_cache:
-            return midpoint_cache[key]
-
-        v0 = verts[i0]
-        v1 = verts[i1]
-        mx = (v0[0] + v1[0]) * 0.5
-        my = (v0[1] + v1[1]) * 0.5
-        mz = (v0[2] + v1[2]) * 0.5
-
-        # 球面上へ正規化
-        m = norm((mx, my, mz))
-        verts.append(m)
-        idx = len(verts) - 1
-        midpoint_cache[key] = idx
-        return idx
+    faces = np.array(
+        [
+            (0, 11, 5),
+            (0, 5, 1),
+            (0, 1, 7),
+            (0, 7, 10),
+            (0, 10, 11),
+            (1, 5, 9),
+            (5, 11, 4),
+            (11, 10, 2),
+            (10, 7, 6),
+            (7, 1, 8),
+            (3, 9, 4),
+            (3, 4, 2),
+            (3, 2, 6),
+            (3, 6, 8),
+            (3, 8, 9),
+            (4, 9, 5),
+            (2, 4, 11),
+            (6, 2, 10),
+            (8, 6, 7),
+            (9, 8, 1),
+        ]
+    )
 
     # --------------------------------------
-    # 4. subdivision を N 回
+    # 3. subdivision を N 回
+    #    各面の辺 (i0,i1), (i1,i2), (i2,i0) の中点をまとめて作る
     # --------------------------------------
     for _ in range(subdivisions):
-        new_faces = []
-        midpoint_cache.clear()
-
-        for i0, i1, i2 in faces:
-            a = midpoint(i0, i1)
-            b = midpoint(i1, i2)
-            c = midpoint(i2, i0)
+        edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
 
-            # 4つの三角形に分割
-            new_faces.append((i0, a, c))
-            new_faces.append((i1, b, a))
-            new_faces.append((i2, c, b))
-            new_faces.append((a, b, c))
+        # 重複する辺は 1 つの中点を共有する
+        # （中点の番号は元のループと同じく初出順に振る）
+        uniq, first, inverse = np.unique(
+            edges, axis=0, return_index=True, return_inverse=True
+        )
+        order = np.argsort(first)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
 
-        faces = new_faces
+        # 球面上へ正規化
+        mids = norm((verts[uniq[order, 0]] + verts[uniq[order, 1]]) * 0.5)
+        mid_idx = (len(verts) + rank[inverse.ravel()]).reshape(-1, 3)
+        verts = np.vstack([verts, mids])
+
+        # 4つの三角形に分割
+        i0, i1, i2 = faces[:, 0], faces[:, 1], faces[:, 2]
+        a, b, c = mid_idx[:, 0], mid_idx[:, 1], mid_idx[:, 2]
+        faces = np.stack(
+            [
+                np.stack([i0, a, c], axis=-1),
+                np.stack([i1, b, a], axis=-1),
+                np.stack([i2, c, b], axis=-1),
+                np.stack([a, b, c], axis=-1),
+            ],
+            axis=1,
+        ).reshape(-1, 3)
 
     return verts, faces
 
@@ -1,6 +1,83 @@
 import math
+import numpy as np
 import pyxel
-from threed import Camera, Mesh, clip_segment_fast
+from threed import HAS_NUMBA, Camera, Mesh, clip_segment_fast, njit, screen_buffer
+
+
+@njit(cache=True)
+def _round_away(v):
+    """0.5 は 0 から遠い方へ丸める（pyxel の座標の丸めと同じ）"""
+    if v < 0:
+        return -int(math.floor(-v + 0.5))
+    return int(math.floor(v + 0.5))
+
+
+@njit(cache=True)
+def _draw_lines(screen, lines, color):
+    """
+    lines (E, 4) の各線分 (x0, y0, x1, y1) を screen に直接描く。
+    pyxel.line と同じ点を打つように、長い軸方向に 1 ピクセルずつ進め、
+    短い軸は float32 の傾きから丸めて求める。画面外の点は捨てる。
+    """
+    h, w = screen.shape
+    for k in range(lines.shape[0]):
+        x0 = lines[k, 0]
+        y0 = lines[k, 1]
+        x1 = lines[k, 2]
+        y1 = lines[k, 3]
+
+        if x0 == x1 and y0 == y1:
+            if 0 <= x0 < w and 0 <= y0 < h:
+                screen[y0, x0] = color
+            continue
+
+        if abs(x0 - x1) > abs(y0 - y1):
+            # x 方向に長い線分は左端から
+            if x0 > x1:
+                x0, y0, x1, y1 = x1, y1, x0, y0
+            alpha = np.float32(y1 - y0) / np.float32(x1 - x0)
+            for i in range(x1 - x0 + 1):
+                x = x0 + i
+                y = y0 + _round_away(alpha * np.float32(i))
+                if 0 <= x < w and 0 <= y < h:
+                    screen[y, x] = color
+        else:
+            # y 方向に長い線分は上端から
+            if y0 > y1:
+                x0, y0, x1, y1 = x1, y1, x0, y0
+            alpha = np.float32(x1 - x0) / np.float32(y1 - y0)
+            for i in range(y1 - y0 + 1):
+                x = x0 + _round_away(alpha * np.float32(i))
+                y = y0 + i
+                if 0 <= x < w and 0 <= y < h:
+                    screen[y, x] = color
+
+
+@njit(cache=True)
+def _clip_segments(p0, p1, AX, AY, cx, cy, scale):
+    """
+    線分 p0[k]-p1[k]（カメラ座標、(E, 3)）を視錐台でクリップして投影し、
+    残った線分を (K, 4) の画面座標 (x0, y0, x1, y1) にして返す。
+    """
+    n = p0.shape[0]
+    lines = np.empty((n, 4), dtype=np.int32)
+    count = 0
+    for k in range(n):
+        F, X0, Y0, Z0, X1, Y1, Z1 = clip_segment_fast(
+            p0[k, 0], p0[k, 1], p0[k, 2], p1[k, 0], p1[k, 1], p1[k, 2], AX, AY
+        )
+
+        # F=0 → 描画すべき / F=1 → 描画不要
+        if F != 0:
+            continue
+
+        # 投影（Camera.project と同じ式）
+        lines[count, 0] = int(cx + X0 / Z0 * scale)
+        lines[count, 1] = int(cy - Y0 / Z0 * scale)
+        lines[count, 2] = int(cx + X1 / Z1 * scale)
+        lines[count, 3] = int(cy - Y1 / Z1 * scale)
+        count += 1
+    return lines[:count]
 
 
 class WireframeRenderer:
@@ -17,48 +94,83 @@ class WireframeRenderer:
         # ---------------------------------------
         # 1. 頂点: local → world → camera
         # ---------------------------------------
-        cam_pts: list[tuple[float, float, float]] = []
-        for lx, ly, lz in mesh.points:
-            wx, wy, wz = mesh.local_to_world(lx, ly, lz)
-            cx, cy, cz = cam.world_to_camera(wx, wy, wz)
-            cam_pts.append((cx, cy, cz))
+        # model-view 行列で (N, 3) 配列をまとめて変換する
+        cam_np = cam.transform_points(mesh.get_model_matrix(), mesh.points_np)
 
         # ---------------------------------------
         # 2. セグメントが空なら、faces から生成（お好みで）
         # ---------------------------------------
         segments = mesh.segments
-        if not segments and mesh.faces:
-            edges = set()
-            for i0, i1, i2 in mesh.faces:
-                e01 = tuple(sorted((i0, i1)))
-                e12 = tuple(sorted((i1, i2)))
-                e20 = tuple(sorted((i2, i0)))
-                edges.add(e01)
-                edges.add(e12)
-                edges.add(e20)
-            segments = list(edges)
+        # 辺の一覧は Mesh 側で 1 度だけ作ってキャッシュされる
+        if len(segments) == 0 and len(mesh.faces) > 0:
+            segments = mesh.get_edges()
+        segments = np.asarray(segments, dtype=np.int32).reshape(-1, 2)
 
         # ---------------------------------------
         # 3. 各セグメントをクリッピング＆描画
         # ---------------------------------------
-        for i, j in segments:
-            x0, y0, z0 = cam_pts[i]
-            x1, y1, z1 = cam_pts[j]
+        p0 = cam_np[segments[:, 0]]
+        p1 = cam_np[segments[:, 1]]
 
-            # 両端ともカメラ後方なら捨てる
-            if z0 <= 0 and z1 <= 0:
-                continue
+        # 両端ともカメラ後方なら捨てる
+        keep = (p0[:, 2] > 0) | (p1[:, 2] > 0)
+        p0 = p0[keep]
+        p1 = p1[keep]
+
+        if HAS_NUMBA:
+            # 視錐台クリッピングと投影を JIT 版でまとめて行う
+            lines = _clip_segments(p0, p1, cam.AX, cam.AY, cam.cx, cam.cy, cam.scale)
+
+            # 画面バッファがあればそこへまとめて書き込む
+            screen = screen_buffer(pyxel.screen)
+            if screen is not None:
+                _draw_lines(screen, lines, color)
+                return
+            lines = lines.tolist()
+        else:
+            lines = self._clip_segments_py(p0, p1)
+
+        line = pyxel.line
+        for sx0, sy0, sx1, sy1 in lines:
+            line(sx0, sy0, sx1, sy1, color)
+
+    # ---------------------------------------
+    # Numba が無い場合のクリッピング＆投影
+    # 両端とも視野内の線分は NumPy でまとめて投影し、
+    # 視野の境界をまたぐ線分だけ 1 本ずつクリップする
+    # ---------------------------------------
+    def _clip_segments_py(self, p0, p1):
+        cam = self.camera
+        AX = cam.AX
+        AY = cam.AY
+
+        def in_view(p):
+            x, y, z = p[:, 0], p[:, 1], p[:, 2]
+            return (x >= -AX * z) & (x <= AX * z) & (y >= -AY * z) & (y <= AY * z)
+
+        inside = in_view(p0) & in_view(p1)
+
+        # 視野内の線分（Camera.project と同じ式）
+        q0 = p0[inside]
+        q1 = p1[inside]
+        lines = np.stack(
+            [
+                (cam.cx + q0[:, 0] / q0[:, 2] * cam.scale).astype(np.int32),
+                (cam.cy - q0[:, 1] / q0[:, 2] * cam.scale).astype(np.int32),
+                (cam.cx + q1[:, 0] / q1[:, 2] * cam.scale).astype(np.int32),
+                (cam.cy - q1[:, 1] / q1[:, 2] * cam.scale).astype(np.int32),
+            ],
+            axis=1,
+        ).tolist()
 
+        # 境界をまたぐ線分
+        project = cam.project
+        for (x0, y0, z0), (x1, y1, z1) in zip(
+            p0[~inside].tolist(), p1[~inside].tolist()
+        ):
             # 視錐台クリッピング
             F, X0c, Y0c, Z0c, X1c, Y1c, Z1c = clip_segment_fast(
-                x0,
-                y0,
-                z0,
-                x1,
-                y1,
-                z1,
-                cam.AX,
-                cam.AY,
+                x0, y0, z0, x1, y1, z1, AX, AY
             )
 
             # F=0 → 描画すべき / F=1 → 描画不要
@@ -66,7 +178,8 @@ class WireframeRenderer:
                 continue
 
             # 投影
-            sx0, sy0 = cam.project(X0c, Y0c, Z0c)
-            sx1, sy1 = cam.project(X1c, Y1c, Z1c)
+            sx0, sy0 = project(X0c, Y0c, Z0c)
+            sx1, sy1 = project(X1c, Y1c, Z1c)
 
-            pyxel.line(sx0, sy0, sx1, sy1, color)
+            lines.append([sx0, sy0, sx1, sy1])
+        return lines
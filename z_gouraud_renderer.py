@@ -1,6 +1,296 @@
 import math
+import numpy as np
 import pyxel
-from threed import Camera, Mesh
+from threed import (
+    HAS_NUMBA,
+    Camera,
+    Mesh,
+    compute_face_vertex_normals,
+    njit,
+    prange,
+    screen_buffer,
+)
+
+# タイルの一辺（ピクセル）。タイルごとの Zバッファが L1 に収まる大きさ
+TILE = 32
+
+# 16bit Zバッファの初期値（どの深さよりも奥）
+Z_CLEAR = 65535
+
+# 頂点の画面座標の上限（辺関数を 64bit 整数で計算できる範囲）
+GUARD = 1 << 28
+
+
+@njit(fastmath=True, cache=True)
+def _fill_rect(lo_x, hi_x, lo_y, hi_y, tri, zbuf, out, ox, oy, shade_levels):
+    """
+    三角形 tri = (x0, y0, x1, y1, x2, y2, z0, z1, z2, c0, c1, c2) のうち
+    矩形 [lo_x, hi_x] x [lo_y, hi_y] に入る部分をラスタライズし、
+    描いたピクセルの階調を out[y - oy, x - ox] に書き込む。
+    頂点は整数の画面座標、z0〜z2 は 16bit Zバッファの目盛りに直した深さ（0〜65534）。
+
+    辺関数・Z・明るさはいずれも画面上で線形なので、
+    行の左端で 1 度だけ求め、あとは x 方向の増分を足して進める。
+    辺関数は座標を 2 倍した整数で持ち（ピクセル中心が整数になる）、
+    内外判定は 3 つの論理和の符号ビットを 1 回見るだけにする。
+    Z と階調（明るさ × (shade_levels - 1)）は 16.16 の固定小数点で進め、
+    Z は整数のまま Zバッファと比較し、階調は上位 16bit をそのまま色にする。
+    """
+    x0, y0, x1, y1 = int(tri[0]), int(tri[1]), int(tri[2]), int(tri[3])
+    x2, y2 = int(tri[4]), int(tri[5])
+    z0, z1, z2, c0, c1, c2 = tri[6], tri[7], tri[8], tri[9], tri[10], tri[11]
+
+    # 辺関数 e0, e1, e2 の x, y 方向の増分
+    # 逆回りの三角形（denom < 0）は符号を反転して内側を正に揃える
+    denom = (y1 - y2) * (x0 - x2) + (x2 - x1) * (y0 - y2)
+    sgn = 1 if denom > 0 else -1
+    area = denom * sgn
+    a0 = (y1 - y2) * sgn
+    b0 = (x2 - x1) * sgn
+    a1 = (y2 - y0) * sgn
+    b1 = (x0 - x2) * sgn
+    a2 = -a0 - a1
+
+    # Z・明るさを辺関数の 1 次式で表す（w0 = e0 / area, w1 = e1 / area）
+    dz0 = (z0 - z2) / area
+    dz1 = (z1 - z2) / area
+    dz_dx = int(math.floor((a0 * dz0 + a1 * dz1) * 65536.0 + 0.5))
+
+    # 明るさ 0〜1 を階調 0〜shade_levels-1 に直してから補間する
+    s_max = (shade_levels - 1) << 16
+    ds0 = (c0 - c2) * (shade_levels - 1) / area
+    ds1 = (c1 - c2) * (shade_levels - 1) / area
+    s2 = c2 * (shade_levels - 1)
+    ds_dx = int(math.floor((a0 * ds0 + a1 * ds1) * 65536.0 + 0.5))
+
+    for y in range(lo_y, hi_y + 1):
+        # ピクセル中心 (x+0.5, y+0.5) での辺関数の 2 倍（整数）
+        e0 = a0 * (2 * (lo_x - x2) + 1) + b0 * (2 * (y - y2) + 1)
+        e1 = a1 * (2 * (lo_x - x2) + 1) + b1 * (2 * (y - y2) + 1)
+        e2 = 2 * area - e0 - e1
+
+        # 行の左端での Z・階調
+        z = int(math.floor((z2 + 0.5 * e0 * dz0 + 0.5 * e1 * dz1) * 65536.0 + 0.5))
+        s = int(math.floor((s2 + 0.5 * e0 * ds0 + 0.5 * e1 * ds1) * 65536.0 + 0.5))
+
+        for x in range(lo_x, hi_x + 1):
+            # 三角形の内側だけ描画（3 つとも >= 0 なら論理和の符号ビットが立たない）
+            if (e0 | e1 | e2) >= 0:
+                # Zバッファ比較（16bit 整数）
+                zi = z >> 16
+                if zi < 0:
+                    zi = 0
+                if zi < zbuf[y, x]:
+                    zbuf[y, x] = zi
+
+                    # 階調（範囲外は端に寄せる）
+                    out[y - oy, x - ox] = min(max(s, 0), s_max) >> 16
+
+            e0 += 2 * a0
+            e1 += 2 * a1
+            e2 += 2 * a2
+            z += dz_dx
+            s += ds_dx
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _gouraud_fill_tiles(tris, zbuf, out, ox, oy, shade_levels):
+    """
+    三角形の列 tris (T, 12) を画面のタイルに振り分け、タイル単位で並列に描く。
+    タイルごとに担当する Zバッファの範囲が分かれているのでロックは要らない。
+    各タイルの中では tris の順に描くので、結果は 1 枚ずつ描いた場合と同じ。
+    """
+    h, w = zbuf.shape
+    n_tx = (w + TILE - 1) // TILE
+    n_ty = (h + TILE - 1) // TILE
+    n = tris.shape[0]
+
+    # 画面上のバウンディングボックス（描かない三角形は空にしておく）
+    bbox = np.empty((n, 4), dtype=np.int64)
+    counts = np.zeros(n_tx * n_ty + 1, dtype=np.int64)
+    for i in range(n):
+        x0, y0, x1, y1, x2, y2 = (
+            tris[i, 0],
+            tris[i, 1],
+            tris[i, 2],
+            tris[i, 3],
+            tris[i, 4],
+            tris[i, 5],
+        )
+        min_x = max(int(math.floor(min(x0, x1, x2))), 0)
+        max_x = min(int(math.ceil(max(x0, x1, x2))), w - 1)
+        min_y = max(int(math.floor(min(y0, y1, y2))), 0)
+        max_y = min(int(math.ceil(max(y0, y1, y2))), h - 1)
+
+        # 3点が一直線なら描かない
+        # 画面から極端に離れた頂点を持つ面も、整数の辺関数が桁あふれするので描かない
+        if (y1 - y2) * (x0 - x2) + (x2 - x1) * (y0 - y2) == 0:
+            max_x = min_x - 1
+        if max(abs(x0), abs(x1), abs(x2), abs(y0), abs(y1), abs(y2)) > GUARD:
+            max_x = min_x - 1
+        bbox[i, 0] = min_x
+        bbox[i, 1] = max_x
+        bbox[i, 2] = min_y
+        bbox[i, 3] = max_y
+        if min_x > max_x or min_y > max_y:
+            continue
+
+        for ty in range(min_y // TILE, max_y // TILE + 1):
+            for tx in range(min_x // TILE, max_x // TILE + 1):
+                counts[ty * n_tx + tx + 1] += 1
+
+    # タイルごとの三角形リスト（counts の累積和で区切った 1 本の配列）
+    start = np.cumsum(counts)
+    items = np.empty(start[-1], dtype=np.int64)
+    fill = start[:-1].copy()
+    for i in range(n):
+        min_x, max_x, min_y, max_y = bbox[i, 0], bbox[i, 1], bbox[i, 2], bbox[i, 3]
+        if min_x > max_x or min_y > max_y:
+            continue
+        for ty in range(min_y // TILE, max_y // TILE + 1):
+            for tx in range(min_x // TILE, max_x // TILE + 1):
+                t = ty * n_tx + tx
+                items[fill[t]] = i
+                fill[t] += 1
+
+    for t in prange(n_tx * n_ty):
+        tile_x = (t % n_tx) * TILE
+        tile_y = (t // n_tx) * TILE
+        for k in range(start[t], start[t + 1]):
+            i = items[k]
+            lo_x = max(bbox[i, 0], tile_x)
+            hi_x = min(bbox[i, 1], tile_x + TILE - 1)
+            lo_y = max(bbox[i, 2], tile_y)
+            hi_y = min(bbox[i, 3], tile_y + TILE - 1)
+            _fill_rect(lo_x, hi_x, lo_y, hi_y, tris[i], zbuf, out, ox, oy, shade_levels)
+
+
+@njit(cache=True)
+def _prepare_mesh(
+    points,
+    faces,
+    MV,
+    K,
+    lx,
+    ly,
+    lz,
+    ambient,
+    z_near,
+    z_scale,
+    width,
+    height,
+    cull_backfaces,
+    cam,
+    sx,
+    sy,
+    vnorm,
+    intens,
+    tris,
+):
+    """
+    頂点の変換・投影・頂点法線・明度計算と面の選別を 1 つの関数で行い、
+    描画する面だけを _gouraud_fill_tiles に渡す (T, 12) の配列にして返す。
+    draw_mesh の NumPy 版と同じ計算を、途中の配列を作らずに行う。
+    cam〜tris は作業用の配列で、呼び出し側が使い回す（中身は上書きする）。
+    """
+    n = points.shape[0]
+    f = faces.shape[0]
+
+    # 1. ローカル → カメラ座標、2. 投影
+    for i in range(n):
+        px = np.float64(points[i, 0])
+        py = np.float64(points[i, 1])
+        pz = np.float64(points[i, 2])
+        x = MV[0, 0] * px + MV[0, 1] * py + MV[0, 2] * pz + MV[0, 3]
+        y = MV[1, 0] * px + MV[1, 1] * py + MV[1, 2] * pz + MV[1, 3]
+        z = MV[2, 0] * px + MV[2, 1] * py + MV[2, 2] * pz + MV[2, 3]
+        cam[i, 0] = x
+        cam[i, 1] = y
+        cam[i, 2] = z
+        if z > 0:
+            # 投影行列 K を掛けて z で割る（Camera.project_many と同じ式）
+            inv_z = 1.0 / z
+            sx[i] = int((K[0, 0] * x + K[0, 1] * y + K[0, 2] * z) * inv_z)
+            sy[i] = int((K[1, 0] * x + K[1, 1] * y + K[1, 2] * z) * inv_z)
+
+    # 3. 頂点法線（面法線を頂点に足し込む）
+    vnorm[:, :] = 0.0
+    for k in range(f):
+        i0 = faces[k, 0]
+        i1 = faces[k, 1]
+        i2 = faces[k, 2]
+        ux = cam[i1, 0] - cam[i0, 0]
+        uy = cam[i1, 1] - cam[i0, 1]
+        uz = cam[i1, 2] - cam[i0, 2]
+        vx = cam[i2, 0] - cam[i0, 0]
+        vy = cam[i2, 1] - cam[i0, 1]
+        vz = cam[i2, 2] - cam[i0, 2]
+        nx = uy * vz - uz * vy
+        ny = uz * vx - ux * vz
+        nz = ux * vy - uy * vx
+        for i in (i0, i1, i2):
+            vnorm[i, 0] += nx
+            vnorm[i, 1] += ny
+            vnorm[i, 2] += nz
+
+    # 正規化＋明度計算（compute_face_vertex_normals と同じく float32 に丸める）
+    for i in range(n):
+        nx = vnorm[i, 0]
+        ny = vnorm[i, 1]
+        nz = vnorm[i, 2]
+        length = math.sqrt(nx * nx + ny * ny + nz * nz)
+        if length > 0:
+            nx = np.float64(np.float32(nx / length))
+            ny = np.float64(np.float32(ny / length))
+            nz = np.float64(np.float32(nz / length))
+        else:
+            nx, ny, nz = 0.0, 0.0, 1.0
+        dot = nx * lx + ny * ly + nz * lz
+        if dot < 0.0:
+            dot = 0.0
+        c = ambient + dot * (1.0 - ambient)
+        intens[i] = min(max(c, 0.0), 1.0)
+
+    # 4. 描く面だけを詰める
+    count = 0
+    for k in range(f):
+        i0 = faces[k, 0]
+        i1 = faces[k, 1]
+        i2 = faces[k, 2]
+
+        # カメラの後ろに頂点がある面は描かない
+        if cam[i0, 2] <= 0 or cam[i1, 2] <= 0 or cam[i2, 2] <= 0:
+            continue
+
+        x0, y0 = sx[i0], sy[i0]
+        x1, y1 = sx[i1], sy[i1]
+        x2, y2 = sx[i2], sy[i2]
+
+        # 一直線・裏向きの面
+        denom = (y1 - y2) * (x0 - x2) + (x2 - x1) * (y0 - y2)
+        if denom == 0 or (cull_backfaces and denom < 0):
+            continue
+
+        # 画面外の面
+        if max(x0, x1, x2) < 0 or min(x0, x1, x2) >= width:
+            continue
+        if max(y0, y1, y2) < 0 or min(y0, y1, y2) >= height:
+            continue
+
+        tris[count, 0] = x0
+        tris[count, 1] = y0
+        tris[count, 2] = x1
+        tris[count, 3] = y1
+        tris[count, 4] = x2
+        tris[count, 5] = y2
+        for j in range(3):
+            i = faces[k, j]
+            zq = (cam[i, 2] - z_near) * z_scale
+            tris[count, 6 + j] = min(max(zq, 0.0), 65534.0)
+            tris[count, 9 + j] = intens[i]
+        count += 1
+
+    return tris[:count]
 
 
 class ZBufferedGouraudRenderer:
@@ -18,11 +308,16 @@ class ZBufferedGouraudRenderer:
         light_dir=(1.0, -1.0, -1.0),
         ambient: float = 0.2,
         shade_levels: int = 8,
+        cull_backfaces: bool = False,
+        depth_range=(0.1, 100.0),
     ):
         self.camera = camera
         self.ambient = ambient
         self.shade_levels = shade_levels
 
+        # 裏向きの面を描かない（面の向きが揃った閉じたメッシュ向けのオプション）
+        self.cull_backfaces = cull_backfaces
+
         # 画面サイズ
         # camera に screen_w, screen_h があればそれを使う
         if hasattr(camera, "screen_w") and hasattr(camera, "screen_h"):
@@ -38,33 +333,40 @@ class ZBufferedGouraudRenderer:
         L = math.sqrt(lx * lx + ly * ly + lz * lz) or 1.0
         self.light_dir = (lx / L, ly / L, lz / L)
 
-        # Zバッファ
-        self.z_far = 1e9
-        self.zbuf = [[self.z_far] * self.width for _ in range(self.height)]
+        # 描画先の画面バッファ（draw_mesh ごとに取り直す）
+        self.screen = None
+
+        # フレームごとの作業用配列（頂点数・面数ごとに作って使い回す）
+        self._scratch = {}
+        self._out = None
+
+        # Zバッファ（16bit）
+        # depth_range の深さを 0〜65534 に線形に割り当てる。範囲外は端に寄せる
+        self.z_near, self.z_far = depth_range
+        self.z_scale = 65534.0 / (self.z_far - self.z_near)
+        self.zbuf = np.full((self.height, self.width), Z_CLEAR, dtype=np.uint16)
 
     # 毎フレーム最初に呼ぶ
     def clear_zbuffer(self):
-        z_far = self.z_far
-        for y in range(self.height):
-            row = self.zbuf[y]
-            for x in range(self.width):
-                row[x] = z_far
+        self.zbuf.fill(Z_CLEAR)
+
+    # ---------------------------------------------------
+    # カメラ空間の深さ → Zバッファの目盛り（0〜65534）
+    # z はスカラーでも ndarray でもよい
+    # ---------------------------------------------------
+    def quantize_depth(self, z):
+        return np.clip((z - self.z_near) * self.z_scale, 0.0, 65534.0)
 
     # ---------------------------------------------------
     # 頂点法線 → 光強度（0〜1）
+    # nx, ny, nz はスカラーでも ndarray でもよい
     # ---------------------------------------------------
     def compute_intensity(self, nx, ny, nz):
         lx, ly, lz = self.light_dir
-        dot = nx * lx + ny * ly + nz * lz
-        if dot < 0:
-            dot = 0.0
+        dot = np.maximum(nx * lx + ny * ly + nz * lz, 0.0)
         # アンビエント込み
         i = self.ambient + dot * (1.0 - self.ambient)
-        if i < 0.0:
-            i = 0.0
-        if i > 1.0:
-            i = 1.0
-        return i
+        return np.clip(i, 0.0, 1.0)
 
     # ---------------------------------------------------
     # バリセントリック + Zバッファ付き Gouraud 三角形描画
@@ -80,55 +382,154 @@ class ZBufferedGouraudRenderer:
         if denom == 0:
             return
 
+        # 裏向きの面（外向きに巻いた面は画面上で denom > 0 になる）
+        if denom < 0 and self.cull_backfaces:
+            return
+
         w = self.width
         h = self.height
-        zbuf = self.zbuf
 
-        # 画面上のバウンディングボックス
-        min_x = max(int(math.floor(min(x0, x1, x2))), 0)
-        max_x = min(int(math.ceil(max(x0, x1, x2))), w - 1)
-        min_y = max(int(math.floor(min(y0, y1, y2))), 0)
-        max_y = min(int(math.ceil(max(y0, y1, y2))), h - 1)
+        # 面ごとに呼ばれるので math の関数はローカルに束縛しておく
+        floor = math.floor
+        ceil = math.ceil
 
-        if min_x > max_x or min_y > max_y:
+        # 画面上のバウンディングボックス（画面外なら描かない）
+        min_x = int(floor(min(x0, x1, x2)))
+        max_x = int(ceil(max(x0, x1, x2)))
+        min_y = int(floor(min(y0, y1, y2)))
+        max_y = int(ceil(max(y0, y1, y2)))
+        if max_x < 0 or min_x >= w or max_y < 0 or min_y >= h:
             return
 
+        min_x = max(min_x, 0)
+        max_x = min(max_x, w - 1)
+        min_y = max(min_y, 0)
+        max_y = min(max_y, h - 1)
+
+        z0 = self.quantize_depth(z0)
+        z1 = self.quantize_depth(z1)
+        z2 = self.quantize_depth(z2)
         inv_denom = 1.0 / denom
+        screen = self.screen
+
+        if HAS_NUMBA:
+            # JIT 版カーネルで描く（画面バッファがあればそこへ直接書き込む）
+            if screen is not None:
+                out, ox, oy = screen, 0, 0
+            else:
+                out = np.full((max_y - min_y + 1, max_x - min_x + 1), -1, np.int32)
+                ox, oy = min_x, min_y
+            tri = np.array([[x0, y0, x1, y1, x2, y2, z0, z1, z2, c0, c1, c2]])
+            _gouraud_fill_tiles(tri, self.zbuf, out, ox, oy, self.shade_levels)
+            if screen is not None:
+                return
+            iy, ix = np.nonzero(out >= 0)
+            px = ix + min_x
+            py = iy + min_y
+            shade = out[iy, ix]
+        else:
+            tile = self._shade_tile(
+                min_x,
+                max_x,
+                min_y,
+                max_y,
+                p0,
+                z0,
+                c0,
+                p1,
+                z1,
+                c1,
+                p2,
+                z2,
+                c2,
+                inv_denom,
+            )
+            if tile is None:
+                return
+            px, py, shade = tile
+            if screen is not None:
+                screen[py, px] = shade
+                return
+
+        pset = pyxel.pset
+        for x, y, s in zip(px.tolist(), py.tolist(), shade.tolist()):
+            pset(x, y, s)
+
+    # ---------------------------------------------------
+    # _prepare_mesh の作業用配列（頂点数 n・面数 f ごとに 1 組）
+    # ---------------------------------------------------
+    def _scratch_buffers(self, n, f):
+        bufs = self._scratch.get((n, f))
+        if bufs is None:
+            bufs = (
+                np.empty((n, 3)),  # cam
+                np.empty(n),  # sx
+                np.empty(n),  # sy
+                np.empty((n, 3)),  # vnorm
+                np.empty(n),  # intens
+                np.empty((f, 12)),  # tris
+            )
+            self._scratch[(n, f)] = bufs
+        return bufs
+
+    # ---------------------------------------------------
+    # 三角形の列 tris (T, 12) をタイル分割して一括描画（Numba 版）
+    # ---------------------------------------------------
+    def _draw_triangles(self, tris):
+        screen = self.screen
+        if screen is not None:
+            _gouraud_fill_tiles(tris, self.zbuf, screen, 0, 0, self.shade_levels)
+            return
 
-        for y in range(min_y, max_y + 1):
-            # ピクセル中心 (x+0.5, y+0.5) でサンプリング
-            yy = y + 0.5
-            for x in range(min_x, max_x + 1):
-                xx = x + 0.5
-
-                # バリセントリック座標 w0, w1, w2
-                w0 = ((y1 - y2) * (xx - x2) + (x2 - x1) * (yy - y2)) * inv_denom
-                w1 = ((y2 - y0) * (xx - x2) + (x0 - x2) * (yy - y2)) * inv_denom
-                w2 = 1.0 - w0 - w1
-
-                # 三角形の内側だけ描画（>=0 にして境界も含める）
-                if w0 < 0.0 or w1 < 0.0 or w2 < 0.0:
-                    continue
-
-                # Z補間
-                z = w0 * z0 + w1 * z1 + w2 * z2
-                if z <= 0.0:
-                    continue
-
-                # Zバッファ比較
-                if z >= zbuf[y][x]:
-                    continue
-                zbuf[y][x] = z
-
-                # 明るさ補間
-                c = w0 * c0 + w1 * c1 + w2 * c2
-                if c < 0.0:
-                    c = 0.0
-                if c > 1.0:
-                    c = 1.0
-
-                shade = int(c * (self.shade_levels - 1))
-                pyxel.pset(x, y, shade)
+        # pset 用の階調バッファも使い回す（-1 は描かないピクセル）
+        out = self._out
+        if out is None:
+            out = self._out = np.empty(self.zbuf.shape, np.int32)
+        out.fill(-1)
+        _gouraud_fill_tiles(tris, self.zbuf, out, 0, 0, self.shade_levels)
+        py, px = np.nonzero(out >= 0)
+        pset = pyxel.pset
+        for x, y, s in zip(px.tolist(), py.tolist(), out[py, px].tolist()):
+            pset(x, y, s)
+
+    # ---------------------------------------------------
+    # Numba が無い場合の NumPy 版
+    # バウンディングボックス全体を ndarray でまとめて計算し、
+    # 描画するピクセルの (x, y, shade) を返す
+    # ---------------------------------------------------
+    def _shade_tile(
+        self, min_x, max_x, min_y, max_y, p0, z0, c0, p1, z1, c1, p2, z2, c2, inv_denom
+    ):
+        x0, y0 = p0
+        x1, y1 = p1
+        x2, y2 = p2
+
+        # ピクセル中心 (x+0.5, y+0.5) のグリッド
+        xs = np.arange(min_x, max_x + 1) + 0.5
+        ys = np.arange(min_y, max_y + 1) + 0.5
+        X, Y = np.meshgrid(xs, ys)
+
+        # バリセントリック座標
+        w0 = ((y1 - y2) * (X - x2) + (x2 - x1) * (Y - y2)) * inv_denom
+        w1 = ((y2 - y0) * (X - x2) + (x0 - x2) * (Y - y2)) * inv_denom
+        w2 = 1.0 - w0 - w1
+        mask = (w0 >= 0) & (w1 >= 0) & (w2 >= 0)
+
+        # Z補間 + Zバッファ比較（16bit 整数）
+        z = np.floor(w0 * z0 + w1 * z1 + w2 * z2).astype(np.int32)
+        zbuf = self.zbuf[min_y : max_y + 1, min_x : max_x + 1]
+        mask &= z < zbuf
+        if not mask.any():
+            return None
+        zbuf[mask] = z[mask]
+
+        # 明るさ補間
+        c = w0[mask] * c0 + w1[mask] * c1 + w2[mask] * c2
+        c = np.clip(c, 0.0, 1.0)
+        shade = (c * (self.shade_levels - 1)).astype(np.int32)
+
+        iy, ix = np.nonzero(mask)
+        return ix + min_x, iy + min_y, shade
 
     # ---------------------------------------------------
     # メッシュ描画（メイン）
@@ -136,66 +537,65 @@ class ZBufferedGouraudRenderer:
     def draw_mesh(self, mesh: Mesh):
         cam = self.camera
 
-        # 1. ローカル → ワールド → カメラ座標
-        cam_pts = []
-        for x, y, z in mesh.points:
-            wx, wy, wz = mesh.local_to_world(x, y, z)
-            cx, cy, cz = cam.world_to_camera(wx, wy, wz)
-            cam_pts.append((cx, cy, cz))
+        # 描画先の画面バッファ（サイズが合わなければ pset で描く）
+        self.screen = screen_buffer(pyxel.screen)
+        if self.screen is not None and self.screen.shape != self.zbuf.shape:
+            self.screen = None
+
+        if HAS_NUMBA:
+            # 変換から面の選別までを JIT 版で 1 パスで行い、
+            # 残った面をまとめてタイル単位で描く
+            lx, ly, lz = self.light_dir
+            tris = _prepare_mesh(
+                mesh.points_np,
+                mesh.faces_np,
+                cam.get_model_view_matrix(mesh.get_model_matrix()),
+                cam.get_projection_matrix(),
+                lx,
+                ly,
+                lz,
+                self.ambient,
+                self.z_near,
+                self.z_scale,
+                self.width,
+                self.height,
+                self.cull_backfaces,
+                *self._scratch_buffers(len(mesh.points_np), len(mesh.faces_np)),
+            )
+            self._draw_triangles(tris)
+            return
+
+        # 1. ローカル → ワールド → カメラ座標（(N, 3) 配列で一括変換）
+        cam_np = cam.transform_points(mesh.get_model_matrix(), mesh.points_np)
 
         # 2. 投影（スクリーン座標）
-        proj = [None] * len(cam_pts)
-        for i, (x, y, z) in enumerate(cam_pts):
-            if z <= 0.0:
-                proj[i] = None
-            else:
-                sx, sy = cam.project(x, y, z)
-                proj[i] = (float(sx), float(sy), float(z))
+        sx, sy, in_front = cam.project_many(cam_np)
+        sx = sx.astype(np.float64).tolist()
+        sy = sy.astype(np.float64).tolist()
+        sz = cam_np[:, 2].tolist()
+
+        # カメラ前方の頂点だけでできた面を一括で選ぶ
+        faces = mesh.faces_np[in_front[mesh.faces_np].all(axis=1)]
 
         # 3. 頂点法線（カメラ座標系で再計算）
         #    → Mesh の種類に依存しない汎用版
-        vnorm = [(0.0, 0.0, 0.0) for _ in mesh.points]
-
-        for i0, i1, i2 in mesh.faces:
-            v0 = cam_pts[i0]
-            v1 = cam_pts[i1]
-            v2 = cam_pts[i2]
-
-            ux, uy, uz = (v1[0] - v0[0], v1[1] - v0[1], v1[2] - v0[2])
-            vx, vy, vz = (v2[0] - v0[0], v2[1] - v0[1], v2[2] - v0[2])
-
-            # 面法線
-            nx = uy * vz - uz * vy
-            ny = uz * vx - ux * vz
-            nz = ux * vy - uy * vx
-
-            # 頂点に加算（後で正規化）
-            for idx in (i0, i1, i2):
-                nnx, nny, nnz = vnorm[idx]
-                vnorm[idx] = (nnx + nx, nny + ny, nnz + nz)
-
-        # 正規化＋明度計算
-        intens = []
-        for nx, ny, nz in vnorm:
-            length = math.sqrt(nx * nx + ny * ny + nz * nz)
-            if length == 0.0:
-                ix = self.compute_intensity(0.0, 0.0, 1.0)
-            else:
-                ix = self.compute_intensity(nx / length, ny / length, nz / length)
-            intens.append(ix)
+        #    面法線を np.cross でまとめて求め、np.add.at で頂点に足し込む
+        vnorm = compute_face_vertex_normals(cam_np, mesh.faces_np)
+
+        # 明度計算（全頂点まとめて）
+        intens = self.compute_intensity(vnorm[:, 0], vnorm[:, 1], vnorm[:, 2])
 
         # 4. 各三角形を Zバッファ付きで描画
         #    ※ソート不要。順不同でOK。
-        for i0, i1, i2 in mesh.faces:
-            if proj[i0] is None or proj[i1] is None or proj[i2] is None:
-                continue
-
-            x0, y0, z0 = proj[i0]
-            x1, y1, z1 = proj[i1]
-            x2, y2, z2 = proj[i2]
+        intens = intens.tolist()
+        draw_triangle = self._draw_triangle
+        for i0, i1, i2 in faces.tolist():
+            x0, y0, z0 = sx[i0], sy[i0], sz[i0]
+            x1, y1, z1 = sx[i1], sy[i1], sz[i1]
+            x2, y2, z2 = sx[i2], sy[i2], sz[i2]
 
             c0 = intens[i0]
             c1 = intens[i1]
             c2 = intens[i2]
 
-            self._draw_triangle((x0, y0), z0, c0, (x1, y1), z1, c1, (x2, y2), z2, c2)
+            draw_triangle((x0, y0), z0, c0, (x1, y1), z1, c1, (x2, y2), z2, c2)